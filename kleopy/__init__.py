@@ -8,14 +8,19 @@ Submodules
 constants                     : Physical constants and parameters for 216-Kleopatra
 grid_search                   : Numerical methods for finding symmetric periodic orbits
 integrator                    : Numerical integrators for solving ODEs
+integrator_cuda               : CUDA version of the integrators, one GPU thread per grid cell (requires numba and a GPU)
+integrator_jax                : JAX/XLA version of the integrators, batched over grids (requires jax)
 orbital_eq                    : Equations related to the orbital dynamics of 216-Kleopatra
 """
     # kleopy
     #     ├── constants
     #     ├── grid_search
     #     ├── integrator
+    #     ├── integrator_cuda
+    #     ├── integrator_jax
     #     └── orbital_eq 
 
+import importlib
 import logging
 
 #Package version
@@ -29,18 +34,38 @@ logger.addHandler(logging.NullHandler())
 # from .module1 import MainClass, useful_function
 # from .module2 import AnotherClass
 
-submodules = [
+#Read-only list of submodules, imported lazily on first attribute access (PEP 562)
+#so `import kleopy` stays cheap and does not pull in numpy/scipy/numba/jax
+submodules: tuple[str, ...] = (
     "constants",
     "grid_search",
     "integrator",
     "orbital_eq",
-]
+)
+
+#Backends with optional dependencies (numba/GPU, jax), kept out of __all__
+#so `from kleopy import *` does not require them. Reachable as kleopy.<name>
+#or through grid_search.process_grid(backend=...)
+optional_submodules: tuple[str, ...] = (
+    "integrator_cuda",
+    "integrator_jax",
+)
 
-__all__ = submodules + [
+__all__ = [
+    *submodules,
     "__version__",
     "logger",
 ]
 
+def __getattr__(name: str):
+    """Import a submodule on first access, e.g. kleopy.grid_search."""
+    if name in submodules or name in optional_submodules:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(submodules) | set(optional_submodules))
+
 #Package-level initialization code
 def show_version():
     """Print the installed version of kleopy."""
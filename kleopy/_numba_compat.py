@@ -0,0 +1,25 @@
+"""
+Optional numba support (:mod:`kleopy._numba_compat`)
+==========================================================
+Falls back to plain python when numba is not installed, jitted functions then run interpreted.
+
+Kept apart from kleopy.misc so the numerical modules import on every python version kleopy supports.
+
+Functions
+---------
+
+njit(*args, **kwargs)                                         : numba.njit, or a no-op decorator if numba is not installed.
+prange(*args)                                                 : numba.prange, or range if numba is not installed.
+"""
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, supports both @njit and @njit(...) usage."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fun: fun
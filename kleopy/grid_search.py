@@ -11,19 +11,37 @@ find_dyt(x0, C) -> np.ndarray       : Calculate the dy0t value for a given x0 an
 init_grid(x0_min, x0_max,
         C_min, C_max, 
         dif_x0, dif_C, 
-        retgrid=False
+        retgrid=False, dtype=float
         ) -> tuple[np.ndarray, ...] : Initializes a grids of x0, C, and dy0t values for the grid search process.
+process_grid(fun, X0_grid, DY0T_grid,
+        backend='cpu', n_jobs=1
+        ) -> np.ndarray             : Integrates the grid of x0 and dy0t values until the T/2 point.
 """
 #Import libraries
 import numpy as np; import numpy.typing as npt
 import sys; import time
-from kleopy.orbital_eq import potential_eff
+from functools import lru_cache
+from kleopy.orbital_eq import potential_eff_axis, EOM
+from kleopy._numba_compat import HAS_NUMBA
 import kleopy.integrator as integrator
 
-def find_dy0t(x0: float | npt.ArrayLike, C: float | npt.ArrayLike) -> np.ndarray:
+#Number of grid cells per block in find_dy0t, 64k float64 values (512 kB) fit in L2 cache
+_TILE_ELEMENTS = 1 << 16
+
+def _dy0t_tile(U2: np.ndarray, C: np.ndarray, out: np.ndarray) -> None:
+    """
+    Calculate dy0t = sqrt(U2 - C) into out for one block of the grid, where U2 = 2 * potential_eff.
+    Invalid values end up as NaN without a separate masking pass:
+    infinities are replaced by NaN, and sqrt of negative values is NaN.
+    """
+    np.subtract(U2, C, out=out)
+    np.copyto(out, np.nan, where=~(out < np.inf))
+    np.sqrt(out, out=out)
+
+def find_dy0t(x0: float | npt.ArrayLike, C: float | npt.ArrayLike, dtype: npt.DTypeLike = float) -> np.ndarray:
     """
     Calculate the dy0t value for a given x0 and C (Jacobian constant).
-    Uses vectorized operations for performance.
+    Uses vectorized operations for performance, evaluated in cache-sized blocks of rows.
 
     Parameters
     ----------
@@ -31,33 +49,63 @@ def find_dy0t(x0: float | npt.ArrayLike, C: float | npt.ArrayLike) -> np.ndarray
         Initial x-coordinate in the synodic frame.
     C : float or np.ndarray
         Jacobian constant.
+    dtype : data-type, optional
+        Floating point type of the computation and result. Default is float (float64).
     
     Returns
     -------
     dy0t : np.ndarray
         The dy0t value calculated from the effective potential at (x0, 0, 0) and the Jacobian constant C.
     """
-    #Ignore invalid values in potential_eff
-    np.seterr(invalid='ignore', divide='ignore')
-
     #Insure inputs are numpy arrays
-    x0 = np.asarray(x0)
-    C = np.asarray(C)
+    x0 = np.asarray(x0, dtype=dtype)
+    C = np.asarray(C, dtype=dtype)
 
-    #Invalid value handling
-    sqrtval = 2 * potential_eff(x0, 0, 0) - C
-    badmask = (sqrtval < 0) | np.isinf(sqrtval) #Mask for invalid values
-    
-    #Calculate dy0t
-    dy0t = np.sqrt(sqrtval)
+    #The potential only depends on x0, evaluate it before broadcasting against C
+    with np.errstate(invalid='ignore', divide='ignore'):
+        U2 = 2 * potential_eff_axis(x0, dtype=dtype) #2 * potential_eff(x0, 0, 0)
+    return _dy0t_from_potential(U2, C, dtype)
 
-    #Set invalid values to NaN
-    dy0t[badmask] = np.nan 
+def _dy0t_from_potential(U2: np.ndarray, C: np.ndarray, dtype: npt.DTypeLike) -> np.ndarray:
+    """
+    Calculate dy0t = sqrt(U2 - C) on the broadcast grid of U2 and C, where U2 = 2 * potential_eff(x0, 0, 0).
+    """
+    #Singular points of the potential (inf) and negative sqrt arguments (NaN) are expected here,
+    # ... ignore them locally instead of changing numpy's global error state
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shape = np.broadcast_shapes(np.shape(U2), np.shape(C))
+        U2 = np.broadcast_to(U2, shape)
+        C = np.broadcast_to(C, shape)
+        dy0t = np.empty(shape, dtype=dtype)
+        if dy0t.ndim == 0:
+            _dy0t_tile(U2, C, dy0t)
+            return dy0t
+
+        #Work through the grid in blocks of rows that fit in L2 cache,
+        # ... so all passes over a block hit cache instead of main memory
+        block_rows = max(1, _TILE_ELEMENTS // max(1, dy0t[0].size))
+        for start in range(0, shape[0], block_rows):
+            rows = slice(start, start + block_rows)
+            _dy0t_tile(U2[rows], C[rows], dy0t[rows])
     return dy0t
 
+@lru_cache(maxsize=16)
+def _x0_axis(x0_min: float, x0_max: float, dif_x0: float, dtype: np.dtype) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The x0 axis of init_grid and 2 * potential_eff(x0, 0, 0) along it.
+    Cached, so repeated init_grid calls over the same x0 range only recompute the C dependent part.
+    Both arrays are read-only since they are shared between calls, init_grid returns a copy of the axis.
+    """
+    x0_array = np.linspace(x0_min, x0_max, int((x0_max - x0_min) / dif_x0) + 1, dtype=dtype)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        U2 = 2 * potential_eff_axis(x0_array, dtype=dtype)
+    x0_array.flags.writeable = False
+    U2.flags.writeable = False
+    return x0_array, U2
+
 def init_grid(x0_min: float = -3, x0_max: float = 2, C_min: float = -3, C_max: float = 5, *, 
               dif_x0: float = 0.001, dif_C:float = 0.001, 
-              retgrid = False) -> tuple[np.ndarray, ...]:
+              retgrid = False, dtype: npt.DTypeLike = float) -> tuple[np.ndarray, ...]:
     """
     Initializes a grids of x0, C, and dy0t values for the grid search process.
     Indexing is done in ij format, meaning the i-th x0 and j-th C.
@@ -77,15 +125,21 @@ def init_grid(x0_min: float = -3, x0_max: float = 2, C_min: float = -3, C_max: f
         Step size for x0. Default is 0.001.
     dif_C : float, optional
         Step size for C. Default is 0.001.
+    retgrid : bool, optional
+        Whether to also return the (N, 2) array of (x0, C) pairs. Default is False.
+    dtype : data-type, optional
+        Floating point type of the grids. Default is float (float64).
+        np.float32 halves the memory footprint and bandwidth of the grid evaluation,
+        enough for a first filtering pass. process_grid always integrates in float64.
 
     Returns
     -------
     X0_grid : np.ndarray
-        2D array of shape (nx0, nC) containing x0 values for i-th x0 and j-th C.
-        Where C is the jacobian constant.
+        2D array of shape (nx0, 1) containing x0 values for i-th x0.
+        Broadcasts against C_grid and DY0T_grid to shape (nx0, nC).
     C_grid : np.ndarray
-        2D array of shape (nx0, nC) containing C values for i-th x0 and j-th C.
-        Where C is the jacobian constant.
+        2D array of shape (1, nC) containing C values for j-th C.
+        Where C is the jacobian constant. Broadcasts against X0_grid to shape (nx0, nC).
     DY0T_grid : np.ndarray
         2D array of shape (nx0, nC) containing dy0t values for i-th x0 and j-th C.
         Where C is the jacobian constant.
@@ -97,12 +151,14 @@ def init_grid(x0_min: float = -3, x0_max: float = 2, C_min: float = -3, C_max: f
     start_time = time.time()
     sys.stdout.write(f"{'\033[94m'}Initializing grid...{'\033[0m'}")
     #Create a grid of x0 and C values as inputs for the find_dyt function
-    x0_array = np.linspace(x0_min, x0_max, int((x0_max - x0_min) / dif_x0) + 1)
-    C_array = np.linspace(C_min, C_max, int((C_max - C_min) / dif_C) + 1)
-    X0_grid, C_grid = np.meshgrid(x0_array, C_array, indexing='ij') #ij indexing: i-th x0, j-th C
+    x0_array, U2_array = _x0_axis(x0_min, x0_max, dif_x0, np.dtype(dtype))
+    C_array = np.linspace(C_min, C_max, int((C_max - C_min) / dif_C) + 1, dtype=dtype)
+    #ij indexing: i-th x0, j-th C. Broadcasting views instead of a meshgrid, no grid-sized copies
+    X0_grid = x0_array.copy()[:, None] #Writable copy of the cached axis, only nx0 values
+    C_grid = C_array[None, :]
     
-    #Apply the find_dyt function to each pair of (x0, C) in the grid
-    DY0T_grid = find_dy0t(X0_grid, C_grid)
+    #Apply the find_dyt function to each pair of (x0, C) in the grid, reusing the cached potential along x0
+    DY0T_grid = _dy0t_from_potential(U2_array[:, None], C_grid, dtype)
 
     #End time and confirm grid initialization
     end_time = time.time()
@@ -111,13 +167,33 @@ def init_grid(x0_min: float = -3, x0_max: float = 2, C_min: float = -3, C_max: f
     #Return the grids and optionally the grid of pairs (x0, C)
     if retgrid is True:
         # Array of shape (N, 2) containing pairs of (x0, C).
-        grid = np.array(np.meshgrid(x0_array, C_array)).T.reshape(-1, 2)
+        grid = np.column_stack((np.repeat(x0_array, len(C_array)), np.tile(C_array, len(x0_array))))
         return X0_grid, C_grid, DY0T_grid, grid
     else:
         #Returns ij grid of x0, C, and dy0t values.
         return X0_grid, C_grid, DY0T_grid
 
-def process_grid(fun, X0_grid: np.ndarray, DY0T_grid: np.ndarray): #-> np.ndarray:
+def _process_grid_joblib(fun, X0_grid: np.ndarray, DY0T_grid: np.ndarray, n_jobs: int) -> np.ndarray:
+    """
+    Split the grid into blocks of rows and integrate them with find_dxt in parallel worker processes.
+    """
+    try:
+        from joblib import Parallel, delayed, effective_n_jobs #Optional dependency
+    except ImportError as err:
+        raise ImportError("process_grid with n_jobs != 1 requires joblib, or numba for fun=EOM.") from err
+
+    #Several blocks per worker, orbits near the bodies take much longer to integrate than the rest
+    X0_grid, DY0T_grid = np.broadcast_arrays(X0_grid, DY0T_grid)
+    if X0_grid.size == 0:
+        return np.empty(X0_grid.shape) #Nothing to split, same result as the serial path
+    n_blocks = min(len(X0_grid), 4 * effective_n_jobs(n_jobs))
+    blocks = zip(np.array_split(X0_grid, n_blocks), np.array_split(DY0T_grid, n_blocks))
+
+    results = Parallel(n_jobs=n_jobs, backend='loky')(
+        delayed(integrator.find_dxt)(fun, X0_block, DY0T_block) for X0_block, DY0T_block in blocks)
+    return np.concatenate(results, axis=0)
+
+def process_grid(fun, X0_grid: np.ndarray, DY0T_grid: np.ndarray, *, backend: str = 'cpu', n_jobs: int = 1): #-> np.ndarray:
     """
     Integrates the grid of x0, C, and dy0t values until the T/2 point.
     Uses vectorized operations for performance.
@@ -125,12 +201,23 @@ def process_grid(fun, X0_grid: np.ndarray, DY0T_grid: np.ndarray): #-> np.ndarra
     Parameters
     ----------
     X0_grid : np.ndarray
-        2D array of shape (nx0, nC) containing x0 values for i-th x0 and j-th C.
-        Where C is the jacobian constant.
+        2D array of shape (nx0, nC), or (nx0, 1) as returned by init_grid,
+        containing x0 values for i-th x0 and j-th C. Where C is the jacobian constant.
 
     DY0T_grid : np.ndarray
         2D array of shape (nx0, nC) containing dy0t values for i-th x0 and j-th C.
         Where C is the jacobian constant.
+
+    backend : str, optional
+        'cpu' integrates with kleopy.integrator.find_dxt (numba if installed, else scipy).
+        'jax' integrates with kleopy.integrator_jax.find_dxt_jax, fun must be EOM.
+        'cuda' integrates with kleopy.integrator_cuda.find_dxt_cuda on the GPU, fun must be EOM.
+        Default is 'cpu'.
+
+    n_jobs : int, optional
+        Number of worker processes for the 'cpu' backend when numba is not used (no numba, or fun is not EOM).
+        The rows of the grid are split across the workers with joblib. -1 uses all cores.
+        The numba path is already multithreaded and ignores it. Default is 1.
     
     Returns
     -------
@@ -142,8 +229,23 @@ def process_grid(fun, X0_grid: np.ndarray, DY0T_grid: np.ndarray): #-> np.ndarra
     X0_grid = np.asarray(X0_grid)
     DY0T_grid = np.asarray(DY0T_grid)
 
-    #Calculate dxt(T/2) for each pair of (x0, C) in the grid
-    DXT_grid = np.zeros_like(DY0T_grid)  # Initialize the grid
-    DXT_grid = integrator.find_dxt(fun, X0_grid, DY0T_grid)
+    #Calculate dxt(T/2) for each pair of (x0, C) in the grid, find_dxt allocates the output once
+    if backend == 'cpu':
+        if n_jobs != 1 and not (HAS_NUMBA and fun is EOM) and np.broadcast(X0_grid, DY0T_grid).ndim > 0:
+            DXT_grid = _process_grid_joblib(fun, X0_grid, DY0T_grid, n_jobs)
+        else:
+            DXT_grid = integrator.find_dxt(fun, X0_grid, DY0T_grid)
+    elif backend in ('jax', 'cuda'):
+        if fun is not EOM:
+            raise ValueError(f"The {backend!r} backend has its own equations of motion and only supports fun=EOM.")
+        #Optional dependencies, imported on demand
+        if backend == 'jax':
+            from kleopy.integrator_jax import find_dxt_jax
+            DXT_grid = find_dxt_jax(X0_grid, DY0T_grid)
+        else:
+            from kleopy.integrator_cuda import find_dxt_cuda
+            DXT_grid = find_dxt_cuda(X0_grid, DY0T_grid)
+    else:
+        raise ValueError(f"Unknown backend {backend!r}, expected 'cpu', 'jax', or 'cuda'.")
 
     return DXT_grid
\ No newline at end of file
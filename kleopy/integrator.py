@@ -7,20 +7,236 @@ Various functions related to differential equation integrators for 216-Kleopatra
 Functions
 ---------
 
-find_dyt(x0, C) -> np.ndarray       : Calculate the dy0t value for a given x0 and C (Jacobian constant).
-init_grid(x0_min, x0_max,
-        C_min, C_max, 
-        dif_x0, dif_C, 
-        retgrid=False
-        ) -> tuple[np.ndarray, ...] : Initializes a grids of x0, C, and dy0t values for the grid search process.
+find_dxt(fun, x0, dy0t, method='DOP853') -> float | np.ndarray   : Integrate from t=0 to T/2 and return dxt(T/2).
 """
 
 #Import libraries
 import numpy as np; import numpy.typing as npt
+from math import sqrt, isnan
 from scipy.integrate import solve_ivp
+from kleopy._numba_compat import njit, prange, HAS_NUMBA
+from kleopy.orbital_eq import EOM, _EOM_nb
 
-def find_dxt(fun, x0: npt.ArrayLike, dy0t: npt.ArrayLike, method: str = 'DOP853') -> np.ndarray:
+#----- DOP853 tableau -----
+#Same coefficients and step size controller as scipy's solve_ivp(method='DOP853'),
+#only the stages of the step and its error estimate, not the dense output ones.
+#Global contiguous arrays, so numba freezes them as constants.
+_N_STAGES = 12
+_A = np.array([
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0.05260015195876773, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0.0197250569845379, 0.0591751709536137, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0.02958758547680685, 0, 0.08876275643042054, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0.2413651341592667, 0, -0.8845494793282861, 0.924834003261792, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0.037037037037037035, 0, 0, 0.17082860872947386, 0.12546768756682242, 0, 0, 0, 0, 0, 0, 0],
+    [0.037109375, 0, 0, 0.17025221101954405, 0.06021653898045596, -0.017578125, 0, 0, 0, 0, 0, 0],
+    [0.03709200011850479, 0, 0, 0.17038392571223998, 0.10726203044637328, -0.015319437748624402, 0.008273789163814023, 0, 0, 0, 0, 0],
+    [0.6241109587160757, 0, 0, -3.3608926294469414, -0.868219346841726, 27.59209969944671, 20.154067550477894, -43.48988418106996, 0, 0, 0, 0],
+    [0.47766253643826434, 0, 0, -2.4881146199716677, -0.590290826836843, 21.230051448181193, 15.279233632882423, -33.28821096898486, -0.020331201708508627, 0, 0, 0],
+    [-0.9371424300859873, 0, 0, 5.186372428844064, 1.0914373489967295, -8.149787010746927, -18.52006565999696, 22.739487099350505, 2.4936055526796523, -3.0467644718982196, 0, 0],
+    [2.273310147516538, 0, 0, -10.53449546673725, -2.0008720582248625, -17.9589318631188, 27.94888452941996, -2.8589982771350235, -8.87285693353063, 12.360567175794303, 0.6433927460157636, 0],
+])
+_B = np.array([0.054293734116568765, 0, 0, 0,
+               0, 4.450312892752409, 1.8915178993145003, -5.801203960010585,
+               0.3111643669578199, -0.1521609496625161, 0.20136540080403034, 0.04471061572777259])
+_C = np.array([0, 0.05260015195876773, 0.0789002279381516, 0.1183503419072274,
+               0.2816496580927726, 0.3333333333333333, 0.25, 0.3076923076923077,
+               0.6512820512820513, 0.6, 0.8571428571428571, 1.0])
+_E3 = np.array([-0.18980075407240762, 0, 0, 0,
+                0, 4.450312892752409, 1.8915178993145003, -5.801203960010585,
+                -0.4226823213237919, -0.1521609496625161, 0.20136540080403034, 0.02265179219836082,
+                0])
+_E5 = np.array([0.01312004499419488, 0, 0, 0,
+                0, -1.2251564463762044, -0.4957589496572502, 1.6643771824549864,
+                -0.35032884874997366, 0.3341791187130175, 0.08192320648511571, -0.022355307863886294,
+                0])
+
+_SAFETY = 0.9       #Multiply steps computed from asymptotic behaviour of errors by this
+_MIN_FACTOR = 0.2   #Minimum allowed decrease in a step size
+_MAX_FACTOR = 10.0  #Maximum allowed increase in a step size
+_ERROR_EXPONENT = -1 / 8  #-1 / (error estimator order + 1)
+
+#----- Compiled DOP853 integrator -----
+@njit(cache=True, error_model="numpy")
+def _select_initial_step(y0, f0, t_bound, rtol, atol):
+    """
+    Empirically select a good initial step, as in scipy's select_initial_step.
+    """
+    d0 = 0.0; d1 = 0.0
+    for i in range(6):
+        scale = atol + abs(y0[i]) * rtol
+        d0 += (y0[i] / scale)**2
+        d1 += (f0[i] / scale)**2
+    d0 = sqrt(d0 / 6); d1 = sqrt(d1 / 6)
+
+    if d0 < 1e-5 or d1 < 1e-5:
+        h0 = 1e-6
+    else:
+        h0 = 0.01 * d0 / d1
+    h0 = min(h0, t_bound)
+
+    #One explicit Euler step to estimate the second derivative
+    y1 = np.empty(6); f1 = np.empty(6)
+    for i in range(6):
+        y1[i] = y0[i] + h0 * f0[i]
+    _EOM_nb(h0, y1, f1)
+    d2 = 0.0
+    for i in range(6):
+        scale = atol + abs(y0[i]) * rtol
+        d2 += ((f1[i] - f0[i]) / scale)**2
+    d2 = sqrt(d2 / 6) / h0
+
+    if d1 <= 1e-15 and d2 <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2))**(1 / 8)
+    return min(100 * h0, h1, t_bound)
+
+@njit(cache=True, error_model="numpy")
+def _integrate_to_half_period(x0, dy0t, rtol=1e-3, atol=1e-6):
     """
+    Integrate the equations of motion with DOP853 from t=0 to t=T/2.
+    Starts from Y = [x0, 0, 0, 0, dy0t, 0] and returns dxt(T/2), or NaN if the step size underflows.
     """
+    #Not jitted with fastmath, the error norm relies on NaN/inf comparisons to reject bad steps
+    t_bound = np.pi
+    t = 0.0
+    y = np.zeros(6); y[0] = x0; y[4] = dy0t
+    y_new = np.empty(6); y_stage = np.empty(6)
+    K = np.empty((_N_STAGES + 1, 6))
+    f = np.empty(6)
+    _EOM_nb(t, y, f)
+    h_abs = _select_initial_step(y, f, t_bound, rtol, atol)
+
+    while t < t_bound:
+        min_step = 10 * abs(np.nextafter(t, np.inf) - t)
+        if h_abs < min_step:
+            h_abs = min_step
+
+        step_accepted = False
+        step_rejected = False
+        while not step_accepted:
+            #Written as not >= so a NaN step size (e.g. from NaN derivatives at the start) also fails
+            if not (h_abs >= min_step):
+                return np.nan
+
+            #Never step past T/2
+            t_new = min(t + h_abs, t_bound)
+            h = t_new - t
+            h_abs = h
+
+            #Runge-Kutta stages
+            K[0, :] = f
+            for s in range(1, _N_STAGES):
+                for i in range(6):
+                    dy = 0.0
+                    for j in range(s):
+                        dy += _A[s, j] * K[j, i]
+                    y_stage[i] = y[i] + h * dy
+                _EOM_nb(t + _C[s] * h, y_stage, K[s])
+            for i in range(6):
+                dy = 0.0
+                for j in range(_N_STAGES):
+                    dy += _B[j] * K[j, i]
+                y_new[i] = y[i] + h * dy
+            _EOM_nb(t_new, y_new, K[_N_STAGES])
+
+            #Error estimate from the embedded 5th and 3rd order methods
+            err5_norm_2 = 0.0; err3_norm_2 = 0.0
+            for i in range(6):
+                scale = atol + max(abs(y[i]), abs(y_new[i])) * rtol
+                err5 = 0.0; err3 = 0.0
+                for j in range(_N_STAGES + 1):
+                    err5 += _E5[j] * K[j, i]
+                    err3 += _E3[j] * K[j, i]
+                err5_norm_2 += (err5 / scale)**2
+                err3_norm_2 += (err3 / scale)**2
+            if err5_norm_2 == 0 and err3_norm_2 == 0:
+                error_norm = 0.0
+            else:
+                denom = err5_norm_2 + 0.01 * err3_norm_2
+                error_norm = h_abs * err5_norm_2 / sqrt(denom * 6)
+
+            if error_norm < 1:
+                if error_norm == 0:
+                    factor = _MAX_FACTOR
+                else:
+                    factor = min(_MAX_FACTOR, _SAFETY * error_norm**_ERROR_EXPONENT)
+                if step_rejected:
+                    factor = min(1.0, factor)
+                h_abs *= factor
+                step_accepted = True
+            else:
+                #NaN error norms also end up here and shrink the step
+                factor = _SAFETY * error_norm**_ERROR_EXPONENT
+                h_abs *= factor if factor > _MIN_FACTOR else _MIN_FACTOR
+                step_rejected = True
+
+        t = t_new
+        y[:] = y_new
+        f[:] = K[_N_STAGES]
+
+    return y[3]
+
+@njit(parallel=True, cache=True, error_model="numpy")
+def _process_grid_nb(X0_flat, DY0T_flat, out):
+    """
+    Run _integrate_to_half_period on every cell of the flattened grid in parallel.
+    Cells with a NaN x0 or dy0t are skipped and set to NaN.
+    """
+    for i in prange(X0_flat.shape[0]):
+        if isnan(X0_flat[i]) or isnan(DY0T_flat[i]):
+            out[i] = np.nan
+        else:
+            out[i] = _integrate_to_half_period(X0_flat[i], DY0T_flat[i])
+
+def _find_dxt_ivp(fun, x0: float, dy0t: float, method: str) -> float:
+    """
+    Integrate a single orbit with scipy's solve_ivp. Returns NaN if the solver fails.
+    """
+    if isnan(x0) or isnan(dy0t):
+        return np.nan
     sol = solve_ivp(fun, (0, np.pi), [x0, 0, 0, 0, dy0t, 0], method=method, t_eval = (np.pi,))
-    return sol.y[3,0]
\ No newline at end of file
+    return sol.y[3,0] if sol.success else np.nan
+
+def find_dxt(fun, x0: float | npt.ArrayLike, dy0t: float | npt.ArrayLike, method: str = 'DOP853') -> float | np.ndarray:
+    """
+    Integrate the orbits starting at Y = [x0, 0, 0, 0, dy0t, 0] until T/2 and return dxt(T/2).
+    Uses the numba-compiled DOP853 integrator, parallelized over the grid cells,
+    when fun is EOM, method is 'DOP853', and numba is installed.
+    Otherwise falls back to scipy's solve_ivp, one cell at a time.
+
+    Parameters
+    ----------
+    fun : callable
+        Right-hand side of the system, fun(t, Y) -> dYt. Usually kleopy.orbital_eq.EOM.
+    x0 : float or np.ndarray
+        Initial x-coordinate in the synodic frame.
+    dy0t : float or np.ndarray
+        Initial velocity in the y direction in the synodic frame.
+        Broadcast against x0.
+    method : str, optional
+        Integration method passed to solve_ivp. Default is 'DOP853'.
+
+    Returns
+    -------
+    dxt : float or np.ndarray
+        Velocity in the x direction at T/2, with the broadcast shape of x0 and dy0t.
+        NaN where dy0t is NaN or the integration failed.
+    """
+    #Insure inputs are numpy arrays of the same shape
+    x0, dy0t = np.broadcast_arrays(np.asarray(x0, dtype=float), np.asarray(dy0t, dtype=float))
+
+    if HAS_NUMBA and fun is EOM and method == 'DOP853':
+        if x0.ndim == 0:
+            return _integrate_to_half_period(float(x0), float(dy0t))
+        dxt = np.empty(x0.shape)
+        _process_grid_nb(x0.ravel(), dy0t.ravel(), dxt.reshape(-1))
+        return dxt
+
+    if x0.ndim == 0:
+        return _find_dxt_ivp(fun, float(x0), float(dy0t), method)
+    dxt = np.empty(x0.shape)
+    for idx in np.ndindex(x0.shape):
+        dxt[idx] = _find_dxt_ivp(fun, x0[idx], dy0t[idx], method)
+    return dxt
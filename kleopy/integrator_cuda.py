@@ -0,0 +1,203 @@
+"""
+CUDA integration tools (:mod:`kleopy.integrator_cuda`)
+==========================================================
+CUDA version of the DOP853 integrator in kleopy.integrator, one GPU thread per grid cell.
+Requires numba and a CUDA capable GPU (optional dependencies).
+
+Each thread integrates its own orbit entirely in registers and local memory, threads share no state.
+Worth it for grids large enough to amortize the kernel launch and transfers (roughly >1e5 cells).
+
+Functions
+---------
+
+find_dxt_cuda(x0, dy0t) -> np.ndarray           : Integrate from t=0 to T/2 and return dxt(T/2) for every cell.
+"""
+
+#Import libraries
+import math
+import numpy as np; import numpy.typing as npt
+from numba import cuda
+from kleopy.orbital_eq import _EOM_nb
+from kleopy.integrator import (
+    _N_STAGES, _A, _B, _C, _E3, _E5, _SAFETY, _MIN_FACTOR, _MAX_FACTOR, _ERROR_EXPONENT
+)
+
+_THREADS_PER_BLOCK = 256
+
+#Same scalar kernel as the CPU path, compiled as a device function
+_EOM_cuda = cuda.jit(device=True, fastmath=True)(_EOM_nb.py_func)
+
+#----- DOP853 integrator, device side -----
+@cuda.jit(device=True)
+def _select_initial_step(y0, f0, t_bound, rtol, atol):
+    """
+    Empirically select a good initial step, as in scipy's select_initial_step.
+    """
+    d0 = 0.0; d1 = 0.0
+    for i in range(6):
+        scale = atol + abs(y0[i]) * rtol
+        d0 += (y0[i] / scale)**2
+        d1 += (f0[i] / scale)**2
+    d0 = math.sqrt(d0 / 6); d1 = math.sqrt(d1 / 6)
+
+    if d0 < 1e-5 or d1 < 1e-5:
+        h0 = 1e-6
+    else:
+        h0 = 0.01 * d0 / d1
+    h0 = min(h0, t_bound)
+
+    #One explicit Euler step to estimate the second derivative
+    y1 = cuda.local.array(6, np.float64); f1 = cuda.local.array(6, np.float64)
+    for i in range(6):
+        y1[i] = y0[i] + h0 * f0[i]
+    _EOM_cuda(h0, y1, f1)
+    d2 = 0.0
+    for i in range(6):
+        scale = atol + abs(y0[i]) * rtol
+        d2 += ((f1[i] - f0[i]) / scale)**2
+    d2 = math.sqrt(d2 / 6) / h0
+
+    if d1 <= 1e-15 and d2 <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2))**(1 / 8)
+    return min(100 * h0, h1, t_bound)
+
+@cuda.jit(device=True)
+def _integrate_to_half_period(x0, dy0t, rtol, atol):
+    """
+    Integrate the equations of motion with DOP853 from t=0 to t=T/2.
+    Starts from Y = [x0, 0, 0, 0, dy0t, 0] and returns dxt(T/2), or NaN if the step size underflows.
+    Device version of kleopy.integrator._integrate_to_half_period.
+    """
+    t_bound = math.pi
+    t = 0.0
+    y = cuda.local.array(6, np.float64)
+    y_new = cuda.local.array(6, np.float64); y_stage = cuda.local.array(6, np.float64)
+    K = cuda.local.array((_N_STAGES + 1, 6), np.float64)
+    f = cuda.local.array(6, np.float64)
+    for i in range(6):
+        y[i] = 0.0
+    y[0] = x0; y[4] = dy0t
+    _EOM_cuda(t, y, f)
+    h_abs = _select_initial_step(y, f, t_bound, rtol, atol)
+
+    while t < t_bound:
+        #np.nextafter is not available on the device, eps * |t| bounds the spacing of t from above
+        min_step = 10 * max(abs(t) * 2.220446049250313e-16, 5e-324)
+        if h_abs < min_step:
+            h_abs = min_step
+
+        step_accepted = False
+        step_rejected = False
+        while not step_accepted:
+            #Written as not >= so a NaN step size also fails, one hung thread would stall the whole launch
+            if not (h_abs >= min_step):
+                return math.nan
+
+            #Never step past T/2
+            t_new = min(t + h_abs, t_bound)
+            h = t_new - t
+            h_abs = h
+
+            #Runge-Kutta stages
+            for i in range(6):
+                K[0, i] = f[i]
+            for s in range(1, _N_STAGES):
+                for i in range(6):
+                    dy = 0.0
+                    for j in range(s):
+                        dy += _A[s, j] * K[j, i]
+                    y_stage[i] = y[i] + h * dy
+                _EOM_cuda(t + _C[s] * h, y_stage, K[s])
+            for i in range(6):
+                dy = 0.0
+                for j in range(_N_STAGES):
+                    dy += _B[j] * K[j, i]
+                y_new[i] = y[i] + h * dy
+            _EOM_cuda(t_new, y_new, K[_N_STAGES])
+
+            #Error estimate from the embedded 5th and 3rd order methods
+            err5_norm_2 = 0.0; err3_norm_2 = 0.0
+            for i in range(6):
+                scale = atol + max(abs(y[i]), abs(y_new[i])) * rtol
+                err5 = 0.0; err3 = 0.0
+                for j in range(_N_STAGES + 1):
+                    err5 += _E5[j] * K[j, i]
+                    err3 += _E3[j] * K[j, i]
+                err5_norm_2 += (err5 / scale)**2
+                err3_norm_2 += (err3 / scale)**2
+            if err5_norm_2 == 0 and err3_norm_2 == 0:
+                error_norm = 0.0
+            else:
+                denom = err5_norm_2 + 0.01 * err3_norm_2
+                error_norm = h_abs * err5_norm_2 / math.sqrt(denom * 6)
+
+            if error_norm < 1:
+                if error_norm == 0:
+                    factor = _MAX_FACTOR
+                else:
+                    factor = min(_MAX_FACTOR, _SAFETY * error_norm**_ERROR_EXPONENT)
+                if step_rejected:
+                    factor = min(1.0, factor)
+                h_abs *= factor
+                step_accepted = True
+            else:
+                #NaN error norms also end up here and shrink the step
+                factor = _SAFETY * error_norm**_ERROR_EXPONENT
+                h_abs *= factor if factor > _MIN_FACTOR else _MIN_FACTOR
+                step_rejected = True
+
+        t = t_new
+        for i in range(6):
+            y[i] = y_new[i]
+            f[i] = K[_N_STAGES, i]
+
+    return y[3]
+
+#----- Kernel -----
+@cuda.jit
+def _process_grid_kernel(X0_flat, DY0T_flat, out):
+    """
+    One thread per grid cell. Cells with a NaN x0 or dy0t are skipped and set to NaN.
+    """
+    i = cuda.grid(1)
+    if i < X0_flat.shape[0]:
+        x0 = X0_flat[i]; dy0t = DY0T_flat[i]
+        if math.isnan(x0) or math.isnan(dy0t):
+            out[i] = math.nan
+        else:
+            out[i] = _integrate_to_half_period(x0, dy0t, 1e-3, 1e-6)
+
+def find_dxt_cuda(x0: float | npt.ArrayLike, dy0t: float | npt.ArrayLike) -> np.ndarray:
+    """
+    Integrate the orbits starting at Y = [x0, 0, 0, 0, dy0t, 0] until T/2 and return dxt(T/2).
+    CUDA version of kleopy.integrator.find_dxt for fun=EOM, one GPU thread per grid cell.
+
+    Parameters
+    ----------
+    x0 : float or np.ndarray
+        Initial x-coordinate in the synodic frame.
+    dy0t : float or np.ndarray
+        Initial velocity in the y direction in the synodic frame.
+        Broadcast against x0.
+
+    Returns
+    -------
+    dxt : np.ndarray
+        Velocity in the x direction at T/2, with the broadcast shape of x0 and dy0t.
+        NaN where dy0t is NaN or the integration failed.
+    """
+    if not cuda.is_available():
+        raise RuntimeError("No CUDA capable GPU was found, use the 'cpu' or 'jax' backend instead.")
+
+    #Insure inputs are numpy arrays of the same shape
+    x0, dy0t = np.broadcast_arrays(np.asarray(x0, dtype=float), np.asarray(dy0t, dtype=float))
+
+    X0_flat = cuda.to_device(np.ascontiguousarray(x0).ravel())
+    DY0T_flat = cuda.to_device(np.ascontiguousarray(dy0t).ravel())
+    out = cuda.device_array(X0_flat.shape[0], dtype=np.float64)
+
+    blocks = (X0_flat.shape[0] + _THREADS_PER_BLOCK - 1) // _THREADS_PER_BLOCK
+    _process_grid_kernel[blocks, _THREADS_PER_BLOCK](X0_flat, DY0T_flat, out)
+    return out.copy_to_host().reshape(x0.shape)
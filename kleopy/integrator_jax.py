@@ -0,0 +1,195 @@
+"""
+JAX integration tools (:mod:`kleopy.integrator_jax`)
+==========================================================
+JAX/XLA version of the DOP853 integrator in kleopy.integrator, batched over grid cells with jax.vmap.
+Runs on CPU, GPU, or TPU, whichever jax is configured for. Requires jax (optional dependency).
+
+Functions
+---------
+
+EOM_jax(t, Y) -> jax.Array                      : Equations of motion at time t for state vector Y, in jax.numpy.
+find_dxt_jax(x0, dy0t) -> np.ndarray            : Integrate from t=0 to T/2 and return dxt(T/2) for every cell.
+"""
+
+#Import libraries
+import numpy as np; import numpy.typing as npt
+import jax
+import jax.numpy as jnp
+from kleopy import integrator
+from kleopy.integrator import _N_STAGES, _SAFETY, _MIN_FACTOR, _MAX_FACTOR, _ERROR_EXPONENT
+from kleopy.orbital_eq import l1, l2, C_HALF, C_2KMS, C_2K2MS
+
+#----- DOP853 tableau -----
+#Same coefficients and step size controller as kleopy.integrator, as python floats so they are traced as constants
+_A = integrator._A.tolist()
+_B = integrator._B.tolist()
+_C = integrator._C.tolist()
+_E3 = integrator._E3.tolist()
+_E5 = integrator._E5.tolist()
+
+#----- Equations of motion -----
+def EOM_jax(t, Y):
+    """
+    Equations of motion around 216-Kleopatra at state vector Y at time t, written in jax.numpy.
+    Same equations as kleopy.orbital_eq.EOM, term for term as in its kernel _EOM_nb, see there for the layout of Y and dYt.
+    """
+    #Unpack the state vector Y
+    x, y, z, dxt, dyt, dzt = Y
+
+    #Calculating distances from the two bodies in 216-Kleopatra using the state vector Y
+    d1 = x + l1; d2 = x - l2; yz2 = y * y + z * z
+    r1 = jnp.sqrt(d1 * d1 + yz2) #Distance to first body
+    r2 = jnp.sqrt(d2 * d2 + yz2) #Distance to second body
+
+    #Define the variables s, p for the equations of motion
+    s = r1 + r2
+    p = r1 * r2
+
+    #Same hoisted terms as _EOM_nb
+    r1i3 = 1 / (r1 * r1 * r1)
+    r2i3 = 1 / (r2 * r2 * r2)
+    ri3 = r1i3 + r2i3
+    seg = s / ((s * s - 1) * p)
+
+    #Derivative of the state vector Y at time t
+    return jnp.stack([dxt, #dxt
+                      dyt, #dyt
+                      dzt, #dzt
+                      2 * dyt + C_HALF * (d1 * r1i3 + d2 * r2i3 - (1 - C_2KMS / (s * p)) * x), #ddxt
+                      -2 * dxt + (C_HALF * ri3 - (1 - C_2KMS * seg)) * y, #ddyt
+                      (C_HALF * ri3 + C_2K2MS * seg) * z]) #ddzt
+
+#----- DOP853 integrator -----
+def _rms(v):
+    """Root mean square norm, as used by scipy's step size controller."""
+    return jnp.sqrt(jnp.mean(v**2))
+
+def _select_initial_step(y0, f0, t_bound, rtol, atol):
+    """Empirically select a good initial step, as in scipy's select_initial_step."""
+    scale = atol + jnp.abs(y0) * rtol
+    d0 = _rms(y0 / scale); d1 = _rms(f0 / scale)
+    h0 = jnp.where((d0 < 1e-5) | (d1 < 1e-5), 1e-6, 0.01 * d0 / d1)
+    h0 = jnp.minimum(h0, t_bound)
+
+    #One explicit Euler step to estimate the second derivative
+    f1 = EOM_jax(h0, y0 + h0 * f0)
+    d2 = _rms((f1 - f0) / scale) / h0
+
+    h1 = jnp.where((d1 <= 1e-15) & (d2 <= 1e-15),
+                   jnp.maximum(1e-6, h0 * 1e-3),
+                   (0.01 / jnp.maximum(d1, d2))**(1 / 8))
+    return jnp.minimum(jnp.minimum(100 * h0, h1), t_bound)
+
+def _rk_step(t, y, f, h, rtol, atol):
+    """One DOP853 step of size h, returns the new state, its derivative, and the error norm."""
+    #Runge-Kutta stages, unrolled at trace time
+    K = [f]
+    for s in range(1, _N_STAGES):
+        dy = sum(_A[s][j] * K[j] for j in range(s) if _A[s][j] != 0)
+        K.append(EOM_jax(t + _C[s] * h, y + h * dy))
+    y_new = y + h * sum(_B[j] * K[j] for j in range(_N_STAGES) if _B[j] != 0)
+    f_new = EOM_jax(t + h, y_new)
+    K.append(f_new)
+
+    #Error estimate from the embedded 5th and 3rd order methods
+    scale = atol + jnp.maximum(jnp.abs(y), jnp.abs(y_new)) * rtol
+    err5 = sum(_E5[j] * K[j] for j in range(_N_STAGES + 1) if _E5[j] != 0) / scale
+    err3 = sum(_E3[j] * K[j] for j in range(_N_STAGES + 1) if _E3[j] != 0) / scale
+    err5_norm_2 = jnp.sum(err5**2); err3_norm_2 = jnp.sum(err3**2)
+    zero = (err5_norm_2 == 0) & (err3_norm_2 == 0)
+    denom = jnp.where(zero, 1.0, err5_norm_2 + 0.01 * err3_norm_2)
+    error_norm = jnp.where(zero, 0.0, jnp.abs(h) * err5_norm_2 / jnp.sqrt(denom * 6))
+    return y_new, f_new, error_norm
+
+def _integrate_to_half_period(x0, dy0t, rtol=1e-3, atol=1e-6):
+    """
+    Integrate the equations of motion with DOP853 from t=0 to t=T/2 for a single cell.
+    Starts from Y = [x0, 0, 0, 0, dy0t, 0] and returns dxt(T/2), or NaN if the step size underflows.
+    Every iteration of the while loop is one attempted step, accepted or rejected.
+    """
+    t_bound = jnp.pi
+    y0 = jnp.array([x0, 0.0, 0.0, 0.0, dy0t, 0.0])
+    f0 = EOM_jax(0.0, y0)
+    h_abs = _select_initial_step(y0, f0, t_bound, rtol, atol)
+    #Cells with NaN inputs, or NaN derivatives at the start (e.g. on the segment), never enter the loop
+    failed = ~(jnp.isfinite(x0) & jnp.isfinite(dy0t) & jnp.isfinite(h_abs))
+
+    def cond(state):
+        t, y, f, h_abs, rejected, failed = state
+        return (t < t_bound) & ~failed
+
+    def body(state):
+        t, y, f, h_abs, rejected, failed = state
+        min_step = 10 * jnp.abs(jnp.nextafter(t, jnp.inf) - t)
+        #A fresh step is raised to min_step, a retried step below it means failure.
+        #Written as not >= so a NaN step size also fails, one hung lane would stall the whole batch.
+        h_abs = jnp.where(~rejected & (h_abs < min_step), min_step, h_abs)
+        failed = ~(h_abs >= min_step)
+
+        #Never step past T/2
+        t_new = jnp.minimum(t + h_abs, t_bound)
+        h = t_new - t
+        y_new, f_new, error_norm = _rk_step(t, y, f, h, rtol, atol)
+
+        accepted = (error_norm < 1) & ~failed
+        factor_accept = jnp.where(error_norm == 0, _MAX_FACTOR,
+                                  jnp.minimum(_MAX_FACTOR, _SAFETY * error_norm**_ERROR_EXPONENT))
+        factor_accept = jnp.where(rejected, jnp.minimum(1.0, factor_accept), factor_accept)
+        #NaN error norms also end up here and shrink the step
+        factor_reject = _SAFETY * error_norm**_ERROR_EXPONENT
+        factor_reject = jnp.where(factor_reject > _MIN_FACTOR, factor_reject, _MIN_FACTOR)
+        h_abs = h * jnp.where(accepted, factor_accept, factor_reject)
+
+        t = jnp.where(accepted, t_new, t)
+        y = jnp.where(accepted, y_new, y)
+        f = jnp.where(accepted, f_new, f)
+        return t, y, f, h_abs, ~accepted, failed
+
+    t, y, f, h_abs, rejected, failed = jax.lax.while_loop(
+        cond, body, (0.0, y0, f0, h_abs, False, failed))
+    return jnp.where(failed, jnp.nan, y[3])
+
+#Batched over flattened grid cells and compiled once per batch size
+_process_grid_jax = jax.jit(jax.vmap(_integrate_to_half_period, in_axes=(0, 0)))
+
+#Cells per vmap call, bounds the memory of the batched while loop (roughly 1.3 KB per cell)
+_BATCH_SIZE = 1 << 16
+
+def find_dxt_jax(x0: float | npt.ArrayLike, dy0t: float | npt.ArrayLike) -> np.ndarray:
+    """
+    Integrate the orbits starting at Y = [x0, 0, 0, 0, dy0t, 0] until T/2 and return dxt(T/2).
+    JAX version of kleopy.integrator.find_dxt for fun=EOM, vmapped over batches of grid cells.
+
+    Parameters
+    ----------
+    x0 : float or np.ndarray
+        Initial x-coordinate in the synodic frame.
+    dy0t : float or np.ndarray
+        Initial velocity in the y direction in the synodic frame.
+        Broadcast against x0.
+
+    Returns
+    -------
+    dxt : np.ndarray
+        Velocity in the x direction at T/2, with the broadcast shape of x0 and dy0t.
+        NaN where dy0t is NaN or the integration failed.
+    """
+    #Insure inputs are numpy arrays of the same shape
+    x0, dy0t = np.broadcast_arrays(np.asarray(x0, dtype=float), np.asarray(dy0t, dtype=float))
+
+    #Fixed size batches, padded with NaN cells which never enter the integration loop.
+    #Grids smaller than _BATCH_SIZE use the next power of two, so they neither pay for
+    # ... a full batch of padding nor trigger a compile for every grid size.
+    n_cells = x0.size
+    batch_size = min(_BATCH_SIZE, 1 << max(n_cells - 1, 0).bit_length())
+    n_padded = -(-n_cells // batch_size) * batch_size
+    X0_flat = np.full(n_padded, np.nan); X0_flat[:n_cells] = x0.ravel()
+    DY0T_flat = np.full(n_padded, np.nan); DY0T_flat[:n_cells] = dy0t.ravel()
+    dxt = np.empty(n_padded)
+
+    #The integration needs float64, enabled only for this call instead of the whole jax session
+    with jax.enable_x64(True):
+        for start in range(0, n_padded, batch_size):
+            batch = slice(start, start + batch_size)
+            dxt[batch] = _process_grid_jax(jnp.asarray(X0_flat[batch]), jnp.asarray(DY0T_flat[batch]))
+    return dxt[:n_cells].reshape(x0.shape)
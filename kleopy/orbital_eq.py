@@ -10,6 +10,7 @@ Functions
 
 potential(x, y, z) -> float      : Gravitational potential at position (x, y, z).
 potential_eff(x, y, z) -> float  : Effective gravitational potential at position (x, y, z).
+potential_eff_axis(x) -> float   : Effective gravitational potential on the x-axis, at position (x, 0, 0).
 EOM(t, Y) -> np.ndarray          : Equations of motion at time t for state vector Y.
 """
 #Import libraries
@@ -17,12 +18,25 @@ from kleopy.constants import (
     G, m1, m2, ms, l, l1, l2, kappa, T, mu, mu_s
 )
 import numpy as np; import numpy.typing as npt
+from kleopy._numba_compat import njit, HAS_NUMBA
 
 #Bound all constants to the module to improve performance
-G = G; m1 = m1; m2 = m2; ms = ms; l = l; l1 = l1; l2 = l2
-kappa = kappa; T = T; mu = mu; mu_s = mu_s
+#Floats are frozen by numba as compile-time constants in the jitted kernels
+G = G; m1 = m1; m2 = m2; ms = ms; l = float(l); l1 = float(l1); l2 = float(l2)
+kappa = float(kappa); T = T; mu = float(mu); mu_s = float(mu_s)
 
 M = m1 + m2 + ms  #Total mass of 216-Kleopatra
+
+#Weights of the first body, second body, and segment terms in the potentials
+A1 = (1 - mu) * (1 - mu_s)
+A2 = mu * (1 - mu_s)
+A3 = mu_s / l
+
+#Constant factors of the equations of motion, hoisted out of the per-step expressions
+C_HALF = kappa * (1 - mu_s) / 2   #Point mass terms
+C_2KMS = 2 * kappa * mu_s         #Segment terms of ddxt and ddyt
+C_2K2MS = kappa * C_2KMS          #Segment term of ddzt
+
 #----- Potentials -----
 def potential(x: float | npt.ArrayLike, y: float | npt.ArrayLike, z: float | npt.ArrayLike):
     """
@@ -51,14 +65,30 @@ def potential(x: float | npt.ArrayLike, y: float | npt.ArrayLike, z: float | npt
     r1 = np.sqrt((x + l1)**2 + y**2 + z**2) #Distance to first body
     r2 = np.sqrt((x - l2)**2 + y**2 + z**2) #Distance to second body
 
-    #note: i'm 95% sure the "log" in the paper means ln, not base 10...
-    # ... because classical gravity is analogous to electrostatics,
-    # ... and there the potential of a cylinder is proportional to ln(r),
-    # ... so we use np.log which is ln
-    U = -G * M * ((1 - mu) * (1-mu_s)/r1 + mu * (1-mu_s)/r2 + mu_s/l * np.log((r1+r2+l)/(r1+r2-l)))
+    #note: the "log" in the paper means ln, not base 10, as for the potential of a charged segment in electrostatics
+    #ln((s+l)/(s-l)) = 2 * arctanh(l/s), which avoids the cancellation in s-l near the segment
+    s = r1 + r2
+    U = -G * M * (A1/r1 + A2/r2 + 2 * A3 * np.arctanh(l / s))
     return U
 
-def potential_eff(x: float | npt.ArrayLike, y: float | npt.ArrayLike, z: float | npt.ArrayLike) -> np.ndarray:
+def _potential_eff_gravity(r1: np.ndarray, r2: np.ndarray, Omega: np.ndarray) -> None:
+    """
+    Gravitational terms of the effective potential from the distances r1, r2 to the two bodies.
+    Computed in place with ufuncs: writes the result into Omega and overwrites r1 and r2.
+    """
+    #note: the "log" in the paper means ln, not base 10, as for the potential of a charged segment in electrostatics
+    #s = r1 + r2
+    np.add(r1, r2, out=Omega)
+
+    #Point mass terms, reusing the distance buffers
+    np.divide(A1, r1, out=r1); np.divide(A2, r2, out=r2); np.add(r1, r2, out=r1)
+
+    #Segment term A3 * ln((s+l)/(s-l)) = 2 * A3 * arctanh(l/s), no cancellation in s-l near the segment
+    np.divide(l, Omega, out=Omega); np.arctanh(Omega, out=Omega); np.multiply(Omega, 2 * A3, out=Omega)
+    np.add(Omega, r1, out=Omega); np.multiply(Omega, kappa, out=Omega)
+
+def potential_eff(x: float | npt.ArrayLike, y: float | npt.ArrayLike, z: float | npt.ArrayLike,
+                  dtype: npt.DTypeLike = float) -> np.ndarray:
     """
     Effective gravitational potential from 216-Kleopatra at position (x, y, z) due to synodic frame.
     Uses vectorized operations for performance.
@@ -71,6 +101,9 @@ def potential_eff(x: float | npt.ArrayLike, y: float | npt.ArrayLike, z: float |
         y-coordinate in the synodic frame.
     z : float or np.ndarray
         z-coordinate in the synodic frame.
+    dtype : data-type, optional
+        Floating point type of the computation and result. Default is float (float64).
+        np.float32 halves the memory traffic for coarse grid evaluations.
     
     Returns
     -------
@@ -78,22 +111,98 @@ def potential_eff(x: float | npt.ArrayLike, y: float | npt.ArrayLike, z: float |
         Effective gravitational potential at (x,y,z).
     """
     #Convert inputs to numpy arrays for parrallel processing
-    x = np.asarray(x, dtype=float)
-    y = np.asarray(y, dtype=float)
-    z = np.asarray(z, dtype=float)
+    x = np.asarray(x, dtype=dtype)
+    y = np.asarray(y, dtype=dtype)
+    z = np.asarray(z, dtype=dtype)
+
+    #Work in preallocated grid-sized buffers with in-place ufuncs, so each operation
+    # ... is a single pass over memory instead of allocating a fresh temporary
+    shape = np.broadcast_shapes(x.shape, y.shape, z.shape)
+    r1 = np.empty(shape, dtype=dtype); r2 = np.empty(shape, dtype=dtype); Omega = np.empty(shape, dtype=dtype)
+    yz2 = y*y + z*z #Only as large as y and z, usually a scalar
 
     #Calculating distances from the two bodies in 216-Kleopatra
-    r1 = np.sqrt((x + l1)**2 + y**2 + z**2) #Distance to first body
-    r2 = np.sqrt((x - l2)**2 + y**2 + z**2) #Distance to second body
+    np.add(x, l1, out=r1); np.square(r1, out=r1); np.add(r1, yz2, out=r1); np.sqrt(r1, out=r1) #Distance to first body
+    np.subtract(x, l2, out=r2); np.square(r2, out=r2); np.add(r2, yz2, out=r2); np.sqrt(r2, out=r2) #Distance to second body
 
-    #note: i'm 95% sure the "log" in the paper means ln, not base 10...
-    # ... because classical gravity is analogous to electrostatics,
-    # ... and there the potential of a cylinder is proportional to ln(r),
-    # ... so we use np.log which is ln
-    Omega = 1/2 * (x**2 + y**2) + kappa * ((1 - mu) * (1-mu_s)/r1 + mu * (1-mu_s)/r2 + mu_s/l * np.log((r1+r2+l)/(r1+r2-l)))
-    return Omega
+    _potential_eff_gravity(r1, r2, Omega) #Gravitational terms, reusing the distance buffers
+
+    #Centrifugal term 1/2 * (x**2 + y**2)
+    np.square(x, out=r1); np.square(y, out=r2); np.add(r1, r2, out=r1)
+    np.multiply(r1, 0.5, out=r1); np.add(Omega, r1, out=Omega)
+    return Omega[()] #Unwraps 0-d results to a scalar
+
+def potential_eff_axis(x: float | npt.ArrayLike, dtype: npt.DTypeLike = float) -> np.ndarray:
+    """
+    Effective gravitational potential from 216-Kleopatra on the x-axis, at position (x, 0, 0).
+    Same as potential_eff(x, 0, 0), but the distances reduce to |x + l1| and |x - l2|,
+    so no sqrt and no y, z terms are needed.
+
+    Parameters
+    ----------
+    x : float or np.ndarray
+        x-coordinate in the synodic frame.
+    dtype : data-type, optional
+        Floating point type of the computation and result. Default is float (float64).
+    
+    Returns
+    -------
+    Omega : float or np.ndarray
+        Effective gravitational potential at (x,0,0).
+    """
+    #Convert inputs to numpy arrays for parrallel processing
+    x = np.asarray(x, dtype=dtype)
+    r1 = np.empty(x.shape, dtype=dtype); r2 = np.empty(x.shape, dtype=dtype); Omega = np.empty(x.shape, dtype=dtype)
+
+    #Calculating distances from the two bodies in 216-Kleopatra
+    np.add(x, l1, out=r1); np.abs(r1, out=r1) #Distance to first body
+    np.subtract(x, l2, out=r2); np.abs(r2, out=r2) #Distance to second body
+
+    _potential_eff_gravity(r1, r2, Omega) #Gravitational terms, reusing the distance buffers
+
+    #Centrifugal term 1/2 * x**2
+    np.square(x, out=r1); np.multiply(r1, 0.5, out=r1); np.add(Omega, r1, out=Omega)
+    return Omega[()] #Unwraps 0-d results to a scalar
 
 #----- Equations of motion -----
+@njit(cache=True, fastmath=True, error_model="numpy")
+def _EOM_nb(t, Y, out):
+    """
+    Scalar kernel of the equations of motion, compiled with numba when available.
+    Writes the derivative of Y at time t into the preallocated buffer out.
+    See EOM for the layout of Y and out.
+    """
+    #Unpack the state vector Y
+    x = Y[0]; y = Y[1]; z = Y[2]
+    dxt = Y[3]; dyt = Y[4]; dzt = Y[5]
+
+    #Calculating distances from the two bodies in 216-Kleopatra using the state vector Y
+    #Squares as multiplications, python float ** raises OverflowError where numba gives inf
+    #**0.5 instead of math.sqrt, so numpy scalars stay numpy scalars in the IEEE retry of EOM
+    d1 = x + l1; d2 = x - l2; yz2 = y * y + z * z
+    r1 = (d1 * d1 + yz2)**0.5 #Distance to first body
+    r2 = (d2 * d2 + yz2)**0.5 #Distance to second body
+
+    #Define the variables s, d, p for the equations of motion
+    s = r1 + r2
+    # d = r1 - r2 #Apparently not used in the equations of motion
+    p = r1 * r2
+
+    #Inverse cubes with multiplications instead of pow, and their shared sum
+    r1i3 = 1 / (r1 * r1 * r1)
+    r2i3 = 1 / (r2 * r2 * r2)
+    ri3 = r1i3 + r2i3
+    seg = s / ((s * s - 1) * p) #Shared by the segment terms of ddyt and ddzt
+
+    #Derivative of the state vector Y at time t
+    out[0] = dxt #dxt
+    out[1] = dyt #dyt
+    out[2] = dzt #dzt
+    out[3] = (2 * dyt + C_HALF * (d1 * r1i3 + d2 * r2i3
+              - (1 - C_2KMS / (s * p)) * x)) #ddxt
+    out[4] = (-2 * dxt + (C_HALF * ri3 - (1 - C_2KMS * seg)) * y) #ddyt
+    out[5] = (C_HALF * ri3 + C_2K2MS * seg) * z #ddzt
+
 def EOM(t, Y):
     """
     Equations of motion around 216-Kleopatra at state vector Y at time t.
@@ -115,27 +224,19 @@ def EOM(t, Y):
         dYt     =   [dxt, dyt, dzt, ddxt, ddyt, ddzt]
         Indeces:      0    1    2    3     4      5
     """
-    #Unpack the state vector Y
-    x, y, z, dxt, dyt, dzt = Y
-
-    #Calculating distances from the two bodies in 216-Kleopatra using the state vector Y
-    r1 = np.sqrt((x + l1)**2 + y**2 + z**2) #Distance to first body
-    r2 = np.sqrt((x - l2)**2 + y**2 + z**2) #Distance to second body
-
-    #Define the variables s, d, p for the equations of motion
-    s = r1 + r2
-    # d = r1 - r2 #Apparently not used in the equations of motion
-    p = r1 * r2
-
-    #Derivative of the state vector Y at time t
-    dYt = [dxt, #dxt
-           dyt, #dyt
-           dzt, #dzt
-           (2 * dyt + kappa * (1 - mu_s) / 2 * ((x + l1) / (r1**3) +(x - l2) / (r2**3)
-            - (1 - 2 * kappa * mu_s / (s * p)) *x)), #ddxt
-           (-2 * dxt + (kappa * (1 - mu_s)/ 2 * (1 / (r1**3) + 1 / (r2**3))
-            - (1 - 2 * kappa *mu_s * s / ((s**2 - 1) * p))) * y), #ddyt
-           (kappa * ((1 - mu_s) / 2 * (1 / (r1**3) + 1 / (r2**3))
-            + 2 * kappa * mu_s * s / ((s**2 - 1) * p)) * z)] #ddzt
-    dYt = np.array(dYt, dtype=float)
-    return dYt
\ No newline at end of file
+    #Fresh buffer on every call, solve_ivp keeps references to returned derivatives.
+    #The kernel fills it in place, no intermediate list or np.array copy.
+    dYt = np.empty(6)
+    try:
+        if HAS_NUMBA:
+            _EOM_nb(t, np.asarray(Y, dtype=float), dYt)
+        else:
+            #Interpreted kernel: python floats are much cheaper to unpack and combine than numpy scalars
+            _EOM_nb(t, np.asarray(Y, dtype=float).tolist(), dYt)
+    except ArithmeticError:
+        #Only raised without numba, where the kernel divides python floats.
+        #Rerun on numpy scalars, which follow IEEE like the compiled kernel at singular points (e.g. on the segment):
+        # ... the velocities are kept and only the singular terms become inf/NaN
+        with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+            _EOM_nb(t, list(np.asarray(Y, dtype=float)), dYt)
+    return dYt